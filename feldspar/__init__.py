@@ -1,2 +1,2 @@
-from .base import Event, Trace
-from .generators import TraceGenerator
+from .base import Event, EventView, Trace
+from .generators import TraceGenerator, column_map
@@ -1,5 +1,6 @@
 from abc import ABCMeta, abstractmethod
-from collections.abc import Mapping, Sequence
+from collections.abc import MutableMapping, Sequence
+from itertools import repeat
 
 
 class BaseGenerator(metaclass=ABCMeta):
@@ -33,7 +34,7 @@ class Importer(BaseGenerator, metaclass=ABCMeta):
         pass
 
 
-class Event(Mapping):
+class Event(dict):
     """Base event object.
 
     Represents an object that closely resemples the XES standard
@@ -45,33 +46,71 @@ class Event(Mapping):
         at: http://xes-standard.org/ [Accessed 8 Apr. 2020].
     """
 
-    def __init__(self, *args, **kwargs):
-        self.__dict__.update(*args, **kwargs)
+    __slots__ = ()
 
-    def __setitem__(self, key, value):
-        self.__dict__[key] = value
+    def __repr__(self):
+        return 'Event({})'.format(dict.__repr__(self))
+
+
+class EventView(MutableMapping):
+    """Lightweight view on a single event of a `Trace`.
+
+    Reads and writes go straight through to the columns of the underlying
+    trace, hence no event object is ever materialized. Missing attributes
+    are stored as `None` inside the columns and are hidden by the view.
+
+    Parameters
+    ----------
+    columns: dict
+        Columns of the underlying trace, mapping attribute keys to lists
+        of values.
+
+    index: int
+        Position of the event inside the trace.
+
+    length: int
+        Number of events of the underlying trace.
+    """
+
+    __slots__ = ('_columns', '_index', '_length')
+
+    def __init__(self, columns, index, length):
+        self._columns = columns
+        self._index = index
+        self._length = length
 
     def __getitem__(self, key):
-        return self.__dict__[key]
+        value = self._columns[key][self._index]
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        column = self._columns.get(key)
+        if column is None:
+            column = self._columns[key] = [None] * self._length
+        column[self._index] = value
 
     def __delitem__(self, key):
-        del self.__dict__[key]
+        # Raise a `KeyError` on missing attributes
+        self[key]
+        self._columns[key][self._index] = None
 
     def __iter__(self):
-        return iter(self.__dict__)
+        index = self._index
+        return (key for key, column in self._columns.items()
+                if column[index] is not None)
 
     def __len__(self):
-        return len(self.__dict__)
+        index = self._index
+        return sum(1 for column in self._columns.values()
+                   if column[index] is not None)
 
     def __str__(self):
-        return str(self.__dict__)
+        return str(dict(self))
 
     def __repr__(self):
-        return '{}, Event({})'.format(super(Event, self).__repr__(),
-                                      self.__dict__)
-
-    def __eq__(self, other):
-        return self.__dict__ == other.__dict__
+        return 'EventView({})'.format(dict(self))
 
 
 class Trace(Sequence):
@@ -80,10 +119,18 @@ class Trace(Sequence):
     Represents an object that closely resemples the XES standard
     definition [1]_.
 
+    Events are stored column-wise (structure of arrays): one list per 
+    attribute key, all of them of the trace length. Attributes missing in
+    an event are stored as `None`. Indexing a trace returns an `EventView`
+    on the requested event.
+
     Parameters
     ----------
-    *args: iterable
-        Event list.
+    columns: dict, default `None`
+        Mapping of attribute keys to lists of values, one per event.
+
+    length: int, default 0
+        Number of events.
 
     attributes: dict, default `None`
         Set of attributes, specific to the trace.
@@ -93,21 +140,70 @@ class Trace(Sequence):
     attributes: dict
         Set of attributes, specific to the trace.
 
+    columns: dict
+        Mapping of attribute keys to lists of values, one per event.
+
     References
     ----------
     .. [1] Xes-standard.org. (2020). start | XES. [online] Available 
         at: http://xes-standard.org/ [Accessed 8 Apr. 2020].
     """
 
-    def __init__(self, *args, attributes=None):
-        self.__list = list(args)
+    __slots__ = ('__columns', '__length', '__attributes')
+
+    def __init__(self, columns=None, length=0, attributes=None):
+        self.__columns = {} if columns is None else columns
+        self.__length = length
         self.__attributes = {} if attributes is None else attributes
 
+    @classmethod
+    def from_events(cls, *events, attributes=None):
+        """Construct a trace from event mappings.
+
+        Parameters
+        ----------
+        *events: iterable
+            Event list.
+
+        attributes: dict, default `None`
+            Set of attributes, specific to the trace.
+
+        Returns
+        -------
+        `Trace`
+        """
+        columns = dict()
+        for index, event in enumerate(events):
+            for key, value in event.items():
+                column = columns.get(key)
+                if column is None:
+                    column = columns[key] = [None] * len(events)
+                column[index] = value
+
+        return cls(columns, len(events), attributes=attributes)
+
     def __getitem__(self, index):
-        return self.__list[index]
+        if isinstance(index, slice):
+            columns = {key: column[index]
+                       for key, column in self.__columns.items()}
+            return Trace(columns, len(range(*index.indices(self.__length))),
+                         attributes=self.__attributes)
+
+        if index < 0:
+            index += self.__length
+        if not 0 <= index < self.__length:
+            raise IndexError("Trace index out of range.")
+        return EventView(self.__columns, index, self.__length)
+
+    def __iter__(self):
+        # Views are built by `map` from C, rather than through the generic
+        # `Sequence.__iter__` calling `__getitem__` from Python per index
+        length = self.__length
+        return map(EventView, repeat(self.__columns, length), range(length),
+                   repeat(length, length))
 
     def __len__(self):
-        return len(self.__list)
+        return self.__length
 
     def __str__(self):
         return "Trace(attributes={},\nnumber_of_events={}\n)".format(str(self.__attributes), len(self))
@@ -116,10 +212,59 @@ class Trace(Sequence):
         return "Trace(events={})".format(len(self))
 
     def __eq__(self, other):
-        return self.__list == other.__list and self.attributes == other.attributes
+        return (self.__length == other.__length
+                and self.__columns == other.__columns
+                and self.attributes == other.attributes)
+
+    def map_column(self, key, func, vectorized=False):
+        """Maps `func` across the values of a single attribute column.
+
+        Only values present in the column are mapped, missing ones are
+        left as they are. The column is updated in place, hence traces 
+        shared with other objects, e.g. a cache, are changed as well. Use
+        `ElementGenerator.map_column` to map datasets.
+
+        Parameters
+        ----------
+        key: str
+            Attribute key.
+
+        func: function
+            A function mapping an attribute value to a new one.
+
+        vectorized: bool, default False
+            If `True`, `func` is called once with the whole column, missing
+            values included, and has to return a sequence of the same 
+            length. Useful for compiled or array based kernels.
+
+        Returns
+        -------
+        `Trace`
+
+        Examples
+        --------
+        >>> trace[0]["concept:name"]
+        'register request'
+        >>> trace = trace.map_column("concept:name", lambda s: s[0])
+        >>> trace[0]["concept:name"]
+        'r'
+        """
+        column = self.__columns.get(key)
+        if column is not None:
+            if vectorized:
+                column[:] = func(column)
+            else:
+                column[:] = [x if x is None else func(x) for x in column]
+        return self
 
     @property
     def attributes(self):
         """Return trace attributes.
         """
         return self.__attributes
+
+    @property
+    def columns(self):
+        """Return trace columns.
+        """
+        return self.__columns
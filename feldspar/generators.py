@@ -1,20 +1,225 @@
 import gzip
+import io
 import os
 import pickle
+import re
+import struct
+import tempfile
 import warnings
 import zipfile
 from abc import ABCMeta
+from collections import deque
 from collections.abc import Iterator
-import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import compress, islice
+from sys import intern
 
 from dateutil.parser import parse
 from lxml import etree
 
-from .base import BaseGenerator, Event, Importer, Trace
+from .base import BaseGenerator, Importer, Trace
 from .utils import infer_compression, validate_filepath
 
+# SIMD accelerated drop-in replacements of `gzip`, used if installed
+try:
+    from isal import igzip as _gzip
+except ImportError:
+    try:
+        from zlib_ng import gzip_ng as _gzip
+    except ImportError:
+        _gzip = gzip
+
 PARSABLE_COMPRESSIONS = ['gz', 'zip']
 
+# Buffer size of opened sources, large reads reduce the number of calls
+# into the decompressor
+_READ_BUFFER_SIZE = 1024 * 1024
+
+# Number of bytes read from the source per parser feed
+_CHUNK_SIZE = 64 * 1024
+
+# Maximum number of elements cached in memory by default
+_CACHE_MAX_ELEMENTS = 100000
+
+# Header of cache files, a format marker followed by the number of cached
+# elements
+_CACHE_MAGIC = b"FLDSPR01"
+_CACHE_HEADER = struct.Struct('<8sQ')
+
+# Number of elements sent at once to a worker process when mapping
+_MAP_CHUNK_SIZE = 256
+
+# Number of elements passed at once to a vectorized filter predicate
+_FILTER_BATCH_SIZE = 1024
+
+# Number of bytes read at once when splitting a log into blocks of traces
+_BLOCK_SIZE = 1024 * 1024
+
+# Maximum decompressed size of zip entries kept in memory across passes
+_ZIP_MEMORY_LIMIT = 64 * 1024 * 1024
+
+_TRACE_START = re.compile(rb"<trace[\s/>]")
+_ROOT_START = re.compile(rb"<([^\s/>?!]+)(?:[^>\"']|\"[^\"]*\"|'[^']*')*>")
+_COMMENT = re.compile(rb"<!--.*?-->", re.DOTALL)
+_TIMESTAMP = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6})\d*)?"
+    r"(Z|[+-]\d{2}:\d{2})?$")
+
+
+def _open_plain(filepath):
+    return open(filepath, 'rb', buffering=_READ_BUFFER_SIZE)
+
+
+def _open_gz(filepath):
+    return io.BufferedReader(_gzip.open(filepath, 'rb'),
+                             buffer_size=_READ_BUFFER_SIZE)
+
+
+def _open_zip(filepath):
+    # The archive stays open until the returned entry is closed
+    with zipfile.ZipFile(filepath) as archive:
+        return io.BufferedReader(archive.open(archive.namelist()[0]),
+                                 buffer_size=_READ_BUFFER_SIZE)
+
+
+def _read_zip(filepath):
+    """Read the entry of a zip archive into memory.
+
+    Returns
+    -------
+    bytes
+        Decompressed entry, `None` if it exceeds `_ZIP_MEMORY_LIMIT`.
+    """
+    with zipfile.ZipFile(filepath) as archive:
+        info = archive.infolist()[0]
+        if info.file_size > _ZIP_MEMORY_LIMIT:
+            return None
+        return archive.read(info)
+
+
+# Binary stream openers, keyed by compression
+_OPENERS = {
+    None: _open_plain,
+    "gz": _open_gz,
+    "zip": _open_zip,
+}
+
+
+# Lexical forms of `xs:boolean`
+_BOOLEANS = {"true": True, "1": True, "false": False, "0": False}
+
+
+def _as_bool(value):
+    try:
+        return _BOOLEANS[value.strip().lower()]
+    except KeyError:
+        raise ValueError("Invalid boolean: {}.".format(value))
+
+
+# `datetime.fromisoformat` is only available from Python 3.7 on
+_FROMISOFORMAT = getattr(datetime, "fromisoformat", None)
+
+
+def _parse_timestamp(value):
+    """Parse an ISO-8601 timestamp of the form XES timestamps are written 
+    in, e.g. `2010-12-30T14:32:00.000+01:00`, falling back to `dateutil`
+    for any other string.
+
+    Unlike `datetime.fromisoformat` before Python 3.11, fractions of any
+    length and the `Z` suffix are accepted.
+    """
+    match = _TIMESTAMP.match(value)
+    if match is None:
+        return parse(value)
+
+    *fields, fraction, zone = match.groups()
+    microsecond = 0 if fraction is None else int(fraction.ljust(6, "0"))
+    if zone is None:
+        tzinfo = None
+    elif zone == "Z":
+        tzinfo = timezone.utc
+    else:
+        offset = timedelta(hours=int(zone[1:3]), minutes=int(zone[4:6]))
+        tzinfo = timezone(-offset if zone[0] == "-" else offset)
+
+    return datetime(*map(int, fields), microsecond, tzinfo=tzinfo)
+
+
+@lru_cache(maxsize=65536)
+def _parse_date(value):
+    """Parse an XES timestamp.
+
+    XES timestamps are ISO-8601 strings and repeat a lot across a log, 
+    hence the C-implemented `datetime.fromisoformat` is tried first and 
+    results are memoized. Other strings, or any string where 
+    `fromisoformat` is missing, go through `_parse_timestamp`.
+    """
+    if _FROMISOFORMAT is not None:
+        try:
+            return _FROMISOFORMAT(value.replace("Z", "+00:00"))
+        except ValueError:
+            pass
+    return _parse_timestamp(value)
+
+
+# Keys of event attributes with few distinct values across a log, such as
+# activities and resources
+_INTERNED_VALUE_KEYS = frozenset(
+    ["lifecycle:transition", "concept:name", "org:resource", "org:role",
+     "org:group"])
+
+# Value converters of XES attribute types, keyed by local tag name
+_TAG_HANDLERS = {
+    "string": None,
+    "id": None,
+    "int": int,
+    "float": float,
+    "date": _parse_date,
+    "boolean": _as_bool,
+}
+
+
+def column_map(key, vectorized=False):
+    """Decorator marking a function as mapping the values of a single
+    attribute column.
+
+    A decorated function passed to `ElementGenerator.map` is applied to 
+    the column of `key` of every trace, as with 
+    `ElementGenerator.map_column`, rather than to the traces themselves. 
+    The function itself is left unchanged.
+
+    Parameters
+    ----------
+    key: str
+        Attribute key.
+
+    vectorized: bool, default False
+        If `True`, the function is called once per trace with the whole 
+        column. See `Trace.map_column`.
+
+    Returns
+    -------
+    function
+
+    Examples
+    --------
+    >>> @column_map("concept:name")
+    ... def label_initial(name):
+    ...     return name[0]
+    >>> L = TraceGenerator.from_file('/path/to/file.xes')
+    >>> L = L.map(label_initial)
+    >>> first = next(iter(L))
+    >>> first[0]["concept:name"]
+    'r'
+    """
+    def decorator(func):
+        func.column_key = key
+        func.column_vectorized = vectorized
+        return func
+    return decorator
+
 
 class ElementGenerator(BaseGenerator, metaclass=ABCMeta):
     """Base class for element generating objects such as event and trace 
@@ -42,7 +247,7 @@ class ElementGenerator(BaseGenerator, metaclass=ABCMeta):
         self._source = source
         self.__attributes = attributes
 
-    def cache(self, filepath=None):
+    def cache(self, filepath=None, max_elements=_CACHE_MAX_ELEMENTS):
         """Caches the elements in this dataset.
 
         The first time the dataset is iterated over, its elements will 
@@ -70,6 +275,12 @@ class ElementGenerator(BaseGenerator, metaclass=ABCMeta):
             to use for caching elements in this Dataset. If a filename is not 
             provided, the dataset will be cached in memory.
 
+        max_elements: int, default 100000
+            Maximum number of elements cached in memory. Once exceeded, the
+            partial cache is dropped, a warning is issued and elements are
+            passed through from then on. If `None`, the cache is unbounded.
+            Only applies to in-memory caching.
+
         Returns
         -------
         `ElementGenerator`
@@ -99,9 +310,10 @@ class ElementGenerator(BaseGenerator, metaclass=ABCMeta):
             https://www.tensorflow.org/api_docs/python/tf/data/Dataset#cache 
             [Accessed 11 Apr. 2020].
         """
-        return _CacheGenerator(self, filepath=filepath)
+        return _CacheGenerator(self, filepath=filepath,
+                               max_elements=max_elements)
 
-    def filter(self, predicate):
+    def filter(self, predicate, vectorized=False):
         """Filters this dataset according to `predicate`.
 
         .. note::
@@ -113,6 +325,11 @@ class ElementGenerator(BaseGenerator, metaclass=ABCMeta):
         predicate: function
             A function mapping a `ElementGenerator` element to a boolean.
 
+        vectorized: bool, default False
+            If `True`, `predicate` is called once per batch of elements with
+            a list of them, and has to return a sequence of booleans of the
+            same length. Useful for compiled or array based kernels.
+
         Returns
         -------
         `ElementGenerator`
@@ -126,6 +343,13 @@ class ElementGenerator(BaseGenerator, metaclass=ABCMeta):
         >>> len(list(L))
         4
 
+        The same filter, evaluated per batch of traces.
+        >>> L = TraceGenerator.from_file('/path/to/file.xes')
+        >>> L = L.filter(lambda traces: [len(t) <= 5 for t in traces],
+        ...              vectorized=True)
+        >>> len(list(L))
+        4
+
         References
         ----------
         .. [1] TensorFlow. (2020). tf.data.Dataset  |  TensorFlow Core v2.1.0. 
@@ -133,9 +357,10 @@ class ElementGenerator(BaseGenerator, metaclass=ABCMeta):
             https://www.tensorflow.org/api_docs/python/tf/data/Dataset#cache 
             [Accessed 11 Apr. 2020].
         """
-        return _FilterGenerator(self, predicate=predicate)
+        return _FilterGenerator(self, predicate=predicate,
+                                vectorized=vectorized)
 
-    def map(self, map_func):
+    def map(self, map_func, num_parallel_calls=None):
         """Maps `map_func` across the elements of this dataset.
 
         This transformation applies `map_func` to each element of this dataset, 
@@ -155,6 +380,12 @@ class ElementGenerator(BaseGenerator, metaclass=ABCMeta):
             A function mapping a 'ElementGenerator' element to another 
             `ElementGenerator` element.
 
+        num_parallel_calls: int, default `None`
+            Number of worker processes elements are mapped in. Elements are
+            streamed to the workers in chunks and returned in order. If 
+            `None`, elements are mapped sequentially. `map_func` has to be
+            picklable, e.g. a module level function.
+
         Returns
         -------
         `ElementGenerator`
@@ -180,6 +411,10 @@ class ElementGenerator(BaseGenerator, metaclass=ABCMeta):
             "org:resource": "Pete"
         }
 
+        Single attribute columns can be mapped without iterating over
+        the events, see `column_map`.
+        >>> L = L.map(lambda trace: trace.map_column("concept:name", lambda s: s[0]))
+
         We can also change the structure of the elements.
         >>> L = TraceGenerator.from_file('/path/to/file.xes')
         >>> next(iter(L))
@@ -197,7 +432,126 @@ class ElementGenerator(BaseGenerator, metaclass=ABCMeta):
             https://www.tensorflow.org/api_docs/python/tf/data/Dataset#cache 
             [Accessed 11 Apr. 2020].
         """
-        return _MapGenerator(self, map_func)
+        key = getattr(map_func, "column_key", None)
+        if key is not None:
+            map_func = _ColumnMapper(key, map_func, map_func.column_vectorized)
+        return _MapGenerator(self, map_func,
+                             num_parallel_calls=num_parallel_calls)
+
+    def select(self, *keys):
+        """Projects every trace onto the values of the given attribute keys.
+
+        Equivalent to mapping 
+        `lambda trace: tuple(e[key] for e in trace)`, but the trace columns
+        are read directly and no event views are built. Missing values are
+        returned as `None`.
+
+        Parameters
+        ----------
+        *keys: str
+            Attribute keys.
+
+        Returns
+        -------
+        `ElementGenerator`
+
+        Examples
+        --------
+        >>> L = TraceGenerator.from_file('/path/to/file.xes')
+        >>> next(iter(L.select("concept:name")))
+        ('register request', 'examine casually', ...)
+        >>> next(iter(L.select("concept:name", "org:resource")))
+        (('register request', 'Pete'), ('examine casually', 'Mike'), ...)
+        """
+        return _SelectGenerator(self, keys)
+
+    def to_columnar(self, *keys):
+        """Concatenates the columns of all traces of this dataset.
+
+        Elements have to be `Trace` objects. The result is meant to be 
+        handed to array libraries, e.g. `numpy.asarray(columns[key])`, for
+        analyses across the whole log.
+
+        Parameters
+        ----------
+        *keys: str
+            Attribute keys. If none are given, all keys occurring in any
+            trace are returned.
+
+        Returns
+        -------
+        tuple
+            Mapping of attribute keys to lists of values across all events
+            of the dataset, missing values as `None`, and a list of trace
+            offsets. The events of the i-th trace are found between 
+            `offsets[i]` and `offsets[i + 1]`.
+
+        Examples
+        --------
+        >>> L = TraceGenerator.from_file('/path/to/file.xes')
+        >>> columns, offsets = L.to_columnar("concept:name")
+        >>> offsets
+        [0, 9, 14, 19, 24, 37, 42]
+        >>> columns["concept:name"][9:14]
+        ['register request', 'check ticket', ...]
+        """
+        columns = {key: [] for key in keys}
+        offsets = [0]
+        total = 0
+
+        for trace in self:
+            length = len(trace)
+            for key, column in trace.columns.items():
+                values = columns.get(key)
+                if values is None:
+                    if keys:
+                        continue
+                    values = columns[key] = [None] * total
+                elif len(values) < total:
+                    values.extend([None] * (total - len(values)))
+                values.extend(column)
+            total += length
+            offsets.append(total)
+
+        # Pad columns of keys missing in the trailing traces
+        for values in columns.values():
+            if len(values) < total:
+                values.extend([None] * (total - len(values)))
+
+        return columns, offsets
+
+    def map_column(self, key, func, vectorized=False):
+        """Maps `func` across a single attribute column of every trace.
+
+        Shorthand for mapping `Trace.map_column` over this dataset, hence
+        no event views are built. Unlike `Trace.map_column`, the traces of
+        the underlying dataset are not changed, new traces are returned.
+
+        Parameters
+        ----------
+        key: str
+            Attribute key.
+
+        func: function
+            A function mapping an attribute value to a new one.
+
+        vectorized: bool, default False
+            If `True`, `func` is called once per trace with the whole 
+            column. See `Trace.map_column`.
+
+        Returns
+        -------
+        `ElementGenerator`
+
+        Examples
+        --------
+        >>> L = TraceGenerator.from_file('/path/to/file.xes')
+        >>> L = L.map_column("concept:name", lambda s: s[0])
+        >>> first = next(iter(L))
+        >>> first[0]["concept:name"]
+        'r'
+        """
+        return self.map(_ColumnMapper(key, func, vectorized))
 
     @property
     def attributes(self):
@@ -206,6 +560,28 @@ class ElementGenerator(BaseGenerator, metaclass=ABCMeta):
         return self.__attributes
 
 
+def _qualify(tag):
+    """Resolve the namespace of an XES element once, instead of matching
+    local tag names per element.
+
+    Parameters
+    ----------
+    tag: str
+        Tag of any element of the XES file, e.g. the root element.
+
+    Returns
+    -------
+    tuple
+        Namespace prefix, e.g. `"{http://www.xes-standard.org/}"`, and the
+        attribute value converters keyed by fully qualified tag.
+    """
+    namespace = etree.QName(tag).namespace
+    prefix = "" if namespace is None else "{" + namespace + "}"
+
+    return prefix, {prefix + name: handler
+                    for name, handler in _TAG_HANDLERS.items()}
+
+
 class XESImporter(Importer):
     """Importer of XES files. 
 
@@ -237,186 +613,472 @@ class XESImporter(Importer):
 
     def __init__(self, filepath, compression=None, infer_types=False):
         super(XESImporter, self).__init__()
-
-        guess = infer_compression(filepath)
-        if guess is not None:
-            if compression == "infer" and guess.extension not in PARSABLE_COMPRESSIONS:
-                raise ValueError(
-                    "File compression not recognized or not supported. File \
-                    compression: {}.".format(guess))
-                compression = guess
-
-            if compression is None:
+        self.__source = None
+        self.__parser = None
+        self.__target = None
+        self.__primed = False
+
+        # The file is only sniffed if no compression is given explicitly
+        if compression in (None, "infer"):
+            guess = infer_compression(filepath)
+            if compression == "infer":
+                if guess is None:
+                    compression = None
+                elif guess.extension not in PARSABLE_COMPRESSIONS:
+                    raise ValueError(
+                        "File compression not recognized or not supported. File \
+                        compression: {}.".format(guess))
+                else:
+                    compression = guess.extension
+            elif guess is not None:
                 warnings.warn(Warning("The file might not be a '.xes' file."))
 
         self.__compression = compression
         self.__infer_types = infer_types
         self.__filepath = filepath
-        self.__source = None
-        self.__archive = None
-        self.__context = None
+        self.__offset = 0
+        self.__meta = None
+        self.__content = None
+        self.__content_read = False
 
     def __iter__(self):
-        self.__initialize_resources(tag="{*}trace")
+        # Reuse the parser left by reading the meta informations, so the 
+        # log header is not parsed twice. Its source has been closed in 
+        # between, it is reopened where the parser stopped.
+        if self.__primed:
+            self.__primed = False
+            self.__source = self._open()
+            if self.__source.seekable():
+                self.__source.seek(self.__offset)
+            else:
+                # Streamed zip entries can't seek on every Python version,
+                # the already parsed bytes are skipped instead
+                remaining = self.__offset
+                while remaining > 0:
+                    skipped = len(self.__source.read(
+                        min(remaining, _CHUNK_SIZE)))
+                    if not skipped:
+                        break
+                    remaining -= skipped
+        else:
+            self.close()
+            self.__initialize_resources()
         return self
 
     def __next__(self):
-        try:
-            _, elem = next(self.__context)
-            trace = self.__parse_trace(elem)
-            elem.clear()
+        traces = self.__target.traces
 
-            while elem.getprevious() is not None:
-                del elem.getparent()[0]
+        # Feed the parser until at least one trace has been completed
+        while not traces:
+            if not self.__feed():
+                self.close()
+                raise StopIteration
 
-            return trace
+        return traces.popleft()
 
-        except StopIteration:
-            self.__clean_resources()
-            raise StopIteration
+    def __initialize_resources(self):
+        """Setup up source resources, primarily the feedable `lxml` parser 
+        and its target.
+        """
+        self.__source = self._open()
+        self.__target = _XESTarget(self.__infer_types)
+        self.__parser = etree.XMLParser(target=self.__target)
+        self.__offset = 0
 
-    def __initialize_resources(self, events=('end',), tag=None):
-        """Setup up source resources, primarily the `lxml` iterator.
+    def __feed(self):
+        """Feed the next chunk of the source to the parser.
 
-        Parameters
-        ----------
-        events: tuple
-            Parses XML into a tree and generates tuples (event, element)
-            in a SAX-like fashion. `event` is any of 'start', 'end', 
-            'start-ns', 'end-ns'.
-
-        tag: str or sequence
-            The additional tag argument restricts the 'start' and 'end' 
-            events to those elements that match the given tag. The tag 
-            argument can also be a sequence of tags to allow matching more 
-            than one tag. By default, events are generated for all elements. 
-            Note that the 'start-ns' and 'end-ns' events are not impacted 
-            by this restriction.
+        Returns
+        -------
+        bool
+            `False` if the source is exhausted.
         """
-        if self.__compression is None:
-            self.__source = self.__filepath
-        elif self.__compression == "gz":
-            self.__source = gzip.open(self.__filepath)
-        elif self.__compression == "zip":
-            self.__archive = zipfile.ZipFile(self.__filepath)
-            self.__source = self.__archive.open(self.namelist()[0])
-
-        self.__context = etree.iterparse(
-            self.__source, events=events, tag=tag)
-
-    def __clean_resources(self):
-        """Close resources opened in a previous step, such as releasing opened
-        files and archives.
+        if self.__parser is None:
+            return False
+
+        chunk = self.__source.read(_CHUNK_SIZE)
+        if chunk:
+            self.__offset += len(chunk)
+            self.__parser.feed(chunk)
+        else:
+            self.__parser.close()
+            self.__parser = None
+        return True
+
+    def close(self):
+        """Close resources opened by a pending iteration, such as releasing 
+        opened files and archives.
         """
-        # Close the lxml context
-        del self.__context
-
-        # Close archive
-        if self.__compression is not None:
+        if self.__source is not None:
             self.__source.close()
 
-            if self.__archive is not None:
-                self.__archive.close()
+        self.__source = None
+        self.__parser = None
+        self.__target = None
+        self.__primed = False
 
-    def _extract_meta(self):
-        """Extract XES log meta informations such as classifiers, extensions, 
+    def __del__(self):
+        # Release the source of an iteration that was abandoned midway
+        self.close()
+
+    def _open(self):
+        """Open the XES file as binary stream, decompressing it on the fly
+        if needed.
+
+        Returns
+        -------
+        file-like
+        """
+        if self.__compression == "zip":
+            # Small entries are decompressed once, later passes read them 
+            # from memory
+            if not self.__content_read:
+                self.__content = _read_zip(self.__filepath)
+                self.__content_read = True
+            if self.__content is not None:
+                return io.BytesIO(self.__content)
+
+        return _OPENERS[self.__compression](self.__filepath)
+
+    @property
+    def meta(self):
+        """Return XES log meta informations such as classifiers, extensions, 
         attributes and global definitions.
+
+        The meta informations are parsed on first access, up to the first
+        trace. The parser is kept for the next iteration, which then 
+        continues from there, while the source is closed in between.
         """
-        self.__initialize_resources()
-
-        attributes, classifiers, extensions = dict(), dict(), dict()
-        omni = {"trace": dict(), "event": dict()}
-
-        for _, elem in self.__context:
-            if "classifier" in elem.tag:
-                classifiers[elem.attrib["name"]] = elem.attrib
-            if "extension" in elem.tag:
-                extensions[elem.attrib["name"]] = elem.attrib
-            if "global" in elem.tag:
-                for child in elem.iterchildren():
-                    omni[elem.attrib["scope"]][child.attrib["key"]
-                                               ] = self.__parse_attribute(child)
-            # TODO: Add asumption in documentation.
+        if self.__meta is None:
+            primed = self.__target is None
+            if primed:
+                self.__initialize_resources()
+
             # ASSUMPTION: All trace tags lie at the end of the XES file, and
             # after and in-between them there are no other tag types.
-            if "trace" in elem.tag:
-                break
+            target = self.__target
+            while not target.header_parsed and self.__feed():
+                pass
+            self.__meta = target.meta
 
-        self.__clean_resources()
+            # Datasets are not necessarily iterated, e.g. when cached to an
+            # existing file, hence the source is not kept open
+            if primed:
+                self.__source.close()
+                self.__source = None
+                self.__primed = True
 
-        return {
-            'attributes': attributes,
-            'classifiers': classifiers,
-            'extensions': extensions,
-            'omni': omni
-        }
+        return self.__meta
 
-    def __parse_trace(self, trace):
-        """Parse trace as described in the XES standard
-        definition [1]_.
+    def _extract_meta(self):
+        """Extract XES log meta informations such as classifiers, extensions, 
+        attributes and global definitions.
+        """
+        return self.meta
 
-        Parameters
-        ----------
-        trace: lxml.etree.Element
-            XML element representing a trace.
 
-        References
-        ----------
-        .. [1] Xes-standard.org. (2020). start | XES. [online] Available 
-            at: http://xes-standard.org/ [Accessed 8 Apr. 2020]. 
-        """
-        events = list()
-        attrib = dict()
-
-        for child in trace.iterchildren():
-            if "event" in child.tag:
-                e = Event()
-                for attribute in child.iterchildren():
-                    e[attribute.attrib["key"]
-                      ] = self.__parse_attribute(attribute)
-                events.append(e)
-            else:
-                attrib[child.attrib["key"]] = self.__parse_attribute(child)
+class ParallelXESImporter(XESImporter):
+    """Importer of XES files, parsing traces in multiple processes.
 
-        return Trace(*events, attributes=attrib)
+    The decompressed file is read in blocks, which are cut after the last 
+    complete trace. Each block is parsed by a worker process, wrapped in 
+    the root tag of the log. Traces are returned in file order.
 
-    def __parse_attribute(self, attribute):
-        """Parse an attribute as described in the XES standard
-        definition [1]_.
+    .. warning::
+        We assume that trace tags are not namespace prefixed, e.g. 
+        `<trace>` rather than `<xes:trace>`, that no trace tags occur 
+        inside CDATA sections and no `</trace>` inside comments following
+        the first trace.
 
-        Parameters
-        ----------
-        attribute: lxml.etree.Element
-            XML element representing a attribute.
+    Parameters
+    ----------
+    fielpath: str
 
-        References
-        ----------
-        .. [1] Xes-standard.org. (2020). start | XES. [online] Available 
-            at: http://xes-standard.org/ [Accessed 8 Apr. 2020]. 
-        """
-        value = attribute.attrib["value"]
+    compression: str, default None
+        XES file compression. See `XESImporter`.
+
+    infer_types: bool, default False
+        Whether to convert attribute values according to their XES type.
+
+    workers: int, default `None`
+        Number of worker processes. If `None`, the number of CPUs is used.
+    """
+
+    def __init__(self, filepath, compression=None, infer_types=False,
+                 workers=None):
+        super(ParallelXESImporter, self).__init__(
+            filepath, compression, infer_types)
+        self.__infer_types = infer_types
+        self.__workers = os.cpu_count() if workers is None else workers
+        self.__traces = None
+
+    def __iter__(self):
+        # Traces are parsed from a separate stream, release the one 
+        # possibly left open by reading the meta informations
+        self.close()
+        self.__traces = self.__parse_blocks()
+        return self
+
+    def __next__(self):
+        return next(self.__traces)
+
+    def __parse_blocks(self):
+        with self._open() as source, \
+                ProcessPoolExecutor(self.__workers) as executor:
+            # Bound the number of blocks in flight to keep memory flat
+            pending = deque()
+            for header, block, footer in _split_traces(source, _BLOCK_SIZE):
+                pending.append(executor.submit(
+                    _parse_traces, header, block, footer, self.__infer_types))
+                if len(pending) >= 2 * self.__workers:
+                    yield from pending.popleft().result()
+
+            while pending:
+                yield from pending.popleft().result()
+
+
+class _XESTarget:
+    """Parser target building `Trace` objects out of XES parser events.
+
+    `lxml` calls `start` and `end` directly from C while the parser is fed,
+    so no element tree is built. Tags are dispatched through a table of 
+    fully qualified tag names, resolved once from the namespace of the 
+    root element. Completed traces are collected in `traces` until 
+    consumed. Log meta informations are collected in `meta` on the way, 
+    `header_parsed` is set once the first trace starts.
+
+    Parameters
+    ----------
+    infer_types: bool, default False
+        Whether to convert attribute values according to their XES type.
+    """
+
+    def __init__(self, infer_types=False):
+        self.traces = deque()
+        self.meta = {
+            'attributes': dict(),
+            'classifiers': dict(),
+            'extensions': dict(),
+            'omni': {"trace": dict(), "event": dict()}
+        }
+        self.header_parsed = False
+        self.__infer_types = infer_types
+        self.__handlers = None
+        self.__root_tag = None
+        self.__trace_tag = None
+        self.__event_tag = None
+        self.__global_tag = None
+        self.__extension_tag = None
+        self.__classifier_tag = None
+        self.__scope = None
+        self.__stack = []
+        self.__columns = None
+        self.__attrib = None
+        self.__length = 0
+
+    def __resolve_namespace(self, tag):
+        prefix, self.__handlers = _qualify(tag)
+        self.__root_tag = tag
+        self.__trace_tag = prefix + "trace"
+        self.__event_tag = prefix + "event"
+        self.__global_tag = prefix + "global"
+        self.__extension_tag = prefix + "extension"
+        self.__classifier_tag = prefix + "classifier"
+
+    def start(self, tag, attrib):
+        stack = self.__stack
+        if not stack:
+            self.__resolve_namespace(tag)
+            stack.append(tag)
+            return
+
+        parent = stack[-1]
+        stack.append(tag)
+
+        # Event attributes make up the bulk of any log, they are tested for
+        # first
+        if parent == self.__event_tag:
+            if tag in self.__handlers:
+                # Keys repeat in every event, interning lets all columns 
+                # share a single string per key
+                key = intern(attrib["key"])
+                value = self.__parse_value(tag, attrib)
+                if key in _INTERNED_VALUE_KEYS and isinstance(value, str):
+                    value = intern(value)
+                self.__add_event_attribute(key, value)
+        elif tag == self.__trace_tag:
+            self.header_parsed = True
+            self.__columns = dict()
+            self.__attrib = dict()
+            self.__length = 0
+        elif tag in self.__handlers:
+            if parent == self.__trace_tag:
+                self.__attrib[intern(attrib["key"])] = self.__parse_value(
+                    tag, attrib)
+            elif parent == self.__global_tag:
+                omni = self.meta['omni'].setdefault(self.__scope, dict())
+                omni[intern(attrib["key"])] = self.__parse_value(tag, attrib)
+            elif parent == self.__root_tag:
+                self.meta['attributes'][intern(attrib["key"])
+                                        ] = self.__parse_value(tag, attrib)
+        elif parent == self.__root_tag:
+            if tag == self.__global_tag:
+                self.__scope = attrib.get("scope", "event")
+            elif tag == self.__extension_tag:
+                self.meta['extensions'][intern(attrib["name"])] = dict(attrib)
+            elif tag == self.__classifier_tag:
+                self.meta['classifiers'][intern(attrib["name"])] = dict(attrib)
+
+    def end(self, tag):
+        self.__stack.pop()
+
+        if tag == self.__event_tag:
+            self.__length += 1
+        elif tag == self.__trace_tag:
+            length = self.__length
+            # Pad columns of keys missing in the trailing events
+            for column in self.__columns.values():
+                if len(column) < length:
+                    column.extend([None] * (length - len(column)))
+            self.traces.append(
+                Trace(self.__columns, length, attributes=self.__attrib))
+
+    def close(self):
+        pass
+
+    def __add_event_attribute(self, key, value):
+        length = self.__length
+        column = self.__columns.get(key)
+        if column is None:
+            column = self.__columns[key] = [None] * length
+
+        n = len(column)
+        if n > length:
+            # Repeated key inside the same event
+            column[length] = value
+        else:
+            if n < length:
+                column.extend([None] * (length - n))
+            column.append(value)
+
+    def __parse_value(self, tag, attrib):
+        value = attrib.get("value")
 
         if self.__infer_types:
-            try:
-                if "int" in attribute.tag:
-                    value = int(value)
-                if "float" in attribute.tag:
-                    value = float(value)
-                if "date" in attribute.tag:
-                    value = parse(value)
-                # TODO: Extend for id, lists, containers
-            except:
-                pass
+            handler = self.__handlers[tag]
+            if handler is not None and value is not None:
+                # Malformed values are kept as they are
+                try:
+                    value = handler(value)
+                except (ValueError, OverflowError):
+                    pass
 
         return value
 
 
+def _split_traces(source, size):
+    """Split an XES stream into blocks of complete traces.
+
+    Parameters
+    ----------
+    source: file-like
+        Binary XES stream.
+
+    size: int
+        Number of bytes read at once.
+
+    Yields
+    ------
+    tuple
+        Log header up to the root start tag, block of traces and closing
+        tag of the log, all as `bytes`.
+    """
+    header, footer = None, None
+    buffer = b""
+
+    while True:
+        chunk = source.read(size)
+        buffer += chunk
+
+        if header is None:
+            start = _find_trace_start(buffer)
+            if start is not None:
+                prolog, buffer = buffer[:start], buffer[start:]
+                prolog = _COMMENT.sub(b"", prolog)
+                root = _ROOT_START.search(prolog)
+                if root is None:
+                    raise ValueError(
+                        "No root element found before the first trace.")
+                # Workers only need the root tag to resolve the namespace,
+                # the log meta informations are left out
+                header = prolog[:root.end()]
+                footer = b"</" + root.group(1) + b">"
+
+        if header is not None:
+            end = buffer.rfind(b"</trace")
+            end = -1 if end == -1 else buffer.find(b">", end)
+            if end != -1:
+                yield header, buffer[:end + 1], footer
+                buffer = buffer[end + 1:]
+
+        if not chunk:
+            return
+
+
+def _find_trace_start(buffer):
+    """Find the first trace tag of an XES stream, skipping comments.
+
+    Returns
+    -------
+    int
+        Offset of the trace tag, `None` if there is none yet, or it might
+        still lie inside an unterminated comment.
+    """
+    position = 0
+    while True:
+        match = _TRACE_START.search(buffer, position)
+        if match is None:
+            return None
+
+        # Comments do not nest, only the last one opened before the match
+        # can enclose it
+        start = match.start()
+        comment = buffer.rfind(b"<!--", 0, start)
+        if comment == -1:
+            return start
+        end = buffer.find(b"-->", comment + 4)
+        if end == -1:
+            return None
+        if end + 3 <= start:
+            return start
+        position = end + 3
+
+
+def _parse_traces(header, block, footer, infer_types):
+    """Parse a block of traces, as produced by `_split_traces`.
+
+    Returns
+    -------
+    list
+        Parsed `Trace` objects.
+    """
+    target = _XESTarget(infer_types)
+    parser = etree.XMLParser(target=target)
+    parser.feed(header)
+    parser.feed(block)
+    parser.feed(footer)
+    parser.close()
+
+    return list(target.traces)
+
+
 class _PickleImporter(Importer):
     """Importer for pickled elements.
 
-    Elements are expected to have been inserted one-by-one,
-    as the `_PickleImporter` still iterates over the file, 
-    instead of reading all into memory.
+    The file starts with a header holding a format marker and the number
+    of elements. Elements are expected to have been inserted one-by-one,
+    as the `_PickleImporter` reads them one by one instead of reading the
+    whole file into memory.
 
     Parameters
     ----------
@@ -427,18 +1089,34 @@ class _PickleImporter(Importer):
 
     def __init__(self, filepath):
         self.__filepath = filepath
+        with open(filepath, 'rb') as handler:
+            header = handler.read(_CACHE_HEADER.size)
+
+        if (len(header) != _CACHE_HEADER.size
+                or not header.startswith(_CACHE_MAGIC)):
+            raise ValueError(
+                "File is not a cache file of this version of feldspar, it "
+                "might have been written by an older version. Remove it to "
+                "rebuild the cache. Path: {}.".format(filepath))
+        _, self.__length = _CACHE_HEADER.unpack(header)
 
     def __iter__(self):
         self.__source = open(self.__filepath, 'rb')
+        self.__source.seek(_CACHE_HEADER.size)
+        self.__remaining = self.__length
         return self
 
     def __next__(self):
-        try:
-            trace = pickle.load(self.__source)
-            return trace
-        except EOFError:
+        if self.__remaining == 0:
             self.__source.close()
             raise StopIteration
+        self.__remaining -= 1
+        # Every element is a self-contained pickle with its own memo, hence
+        # a fresh unpickler per element
+        return pickle.load(self.__source)
+
+    def __len__(self):
+        return self.__length
 
 
 class TraceGenerator(ElementGenerator):
@@ -457,7 +1135,7 @@ class TraceGenerator(ElementGenerator):
     --------
     First a simple example on how to construct (although very unlikely,
     you'll ever do it this way) and iterate over a `TraceGenerator`. 
-    >>> traces = [ Trace(Event(), Event()), Trace(Event())]
+    >>> traces = [Trace.from_events(Event(), Event()), Trace.from_events(Event())]
     >>> L = TraceGenerator(traces)
     >>> for t in L:
     ...     print(t)
@@ -492,7 +1170,7 @@ class TraceGenerator(ElementGenerator):
         return iter(self._source)
 
     @staticmethod
-    def from_file(filepath, compression=None, infer_type=False):
+    def from_file(filepath, compression=None, infer_type=False, workers=None):
         """Parse an xes-file iteratively. 
 
         .. warning::
@@ -512,20 +1190,32 @@ class TraceGenerator(ElementGenerator):
             * "gz" - gunzip compression
             * "zip" - zip file compression. We assume that there is only one file
                 inside the zip, namely the .xes file.
+
+        infer_type: bool, default False
+            Whether to convert attribute values according to their XES type.
+
+        workers: int, default `None`
+            If given, traces are parsed by that many worker processes using
+            a `ParallelXESImporter`.
         """
-        gen = XESImporter(filepath, compression, infer_type)
-        attributes = gen._extract_meta()
+        if workers is None:
+            gen = XESImporter(filepath, compression, infer_type)
+        else:
+            gen = ParallelXESImporter(
+                filepath, compression, infer_type, workers=workers)
 
-        return TraceGenerator(gen, attributes=attributes)
+        return TraceGenerator(gen, attributes=gen.meta)
 
 
 class _CacheGenerator(ElementGenerator):
     """A `ElementGenerator` that caches the elements of it's source.
     """
 
-    def __init__(self, source, filepath=None):
+    def __init__(self, source, filepath=None, max_elements=_CACHE_MAX_ELEMENTS):
         self.__cached = False
         self.__cache = []
+        self.__max_elements = max_elements
+        self.__disabled = False
 
         # Reference to original generator
         self.__original = source
@@ -545,25 +1235,95 @@ class _CacheGenerator(ElementGenerator):
     def __iter__(self):
         if self.__cached:
             self._source = self.__cache
+        else:
+            # Discard whatever an interrupted iteration left behind
+            self.__cache = []
+            self._source = self.__original
         self._source = iter(self._source)
         return self
 
     def __next__(self):
         try:
             trace = next(self._source)
-            if not self.__cached:
+            if not (self.__cached or self.__disabled):
                 self.__cache.append(trace)
+                if (self.__max_elements is not None
+                        and len(self.__cache) > self.__max_elements):
+                    self.__disable()
             return trace
         except StopIteration:
-            if not self.__cached:
+            if not (self.__cached or self.__disabled):
+                # Completed caches are frozen into a tuple, which drops the
+                # list over-allocation and can't be modified by accident
+                self.__cache = tuple(self.__cache)
                 self.__cached = True
                 self._source = self.__cache
             raise StopIteration
 
+    def warm(self):
+        """Fill the cache in one go, without passing each element through
+        `__next__`.
+
+        Does nothing if the elements are already cached or caching has 
+        been disabled.
+
+        Returns
+        -------
+        `ElementGenerator`
+        """
+        if not (self.__cached or self.__disabled):
+            if self.__max_elements is None:
+                cache = tuple(self.__original)
+            else:
+                cache = tuple(islice(self.__original, self.__max_elements + 1))
+                if len(cache) > self.__max_elements:
+                    self.__disable()
+                    return self
+            self.__cache = cache
+            self.__cached = True
+            self._source = cache
+        return self
+
+    def __disable(self):
+        """Stop caching, elements are passed through from the original 
+        generator from now on.
+        """
+        warnings.warn(Warning(
+            "Dataset exceeds {} elements, caching is disabled. Consider "
+            "caching to a file instead.".format(self.__max_elements)))
+        self.__cache = []
+        self.__disabled = True
+
     def __pickle_generator_to_file(self, source, filepath):
-        with open(filepath, 'wb') as handler:
-            for trace in source:
-                pickle.dump(trace, handler)
+        # Elements are pickled one-by-one on purpose. Pickling blocks of
+        # elements makes the memo table grow across the whole block, which
+        # measured slower to load than per element pickles.
+        # Elements are written to a temporary file, which only replaces the
+        # cache file once complete. An interrupted write leaves the cache 
+        # file empty, hence it is rebuilt next time.
+        # A unique temporary file keeps concurrent writers of the same
+        # cache apart
+        descriptor, tmp_filepath = tempfile.mkstemp(
+            dir=os.path.dirname(os.fspath(filepath)) or None)
+        try:
+            with os.fdopen(descriptor, 'wb') as handler:
+                # Placeholder header, overwritten with the final count
+                handler.write(_CACHE_HEADER.pack(_CACHE_MAGIC, 0))
+                # A single pickler is reused, its memo is cleared after 
+                # every element to keep it small
+                pickler = pickle.Pickler(
+                    handler, protocol=pickle.HIGHEST_PROTOCOL)
+                count = 0
+                for trace in source:
+                    pickler.dump(trace)
+                    pickler.clear_memo()
+                    count += 1
+                handler.seek(0)
+                handler.write(_CACHE_HEADER.pack(_CACHE_MAGIC, count))
+            os.replace(tmp_filepath, filepath)
+        finally:
+            if os.path.exists(tmp_filepath):
+                os.remove(tmp_filepath)
 
     @property
     def attributes(self):
@@ -572,29 +1332,162 @@ class _CacheGenerator(ElementGenerator):
         if self._source is None:
             raise ValueError(
                 "No underlying generator has yet been initialized.")
-        if self.__cached:
-            return self.__original.attributes
-        return self._source.attributes
+        return self.__original.attributes
 
 
 class _FilterGenerator(ElementGenerator):
     """A `ElementGenerator` that filters the elements of it's source.
+
+    Consecutive filters are fused into a single generator holding all 
+    predicates.
     """
 
-    def __init__(self, source, predicate):
+    def __init__(self, source, predicate, vectorized=False):
+        predicates = ((predicate, vectorized),)
+        if isinstance(source, _FilterGenerator):
+            predicates = source.__predicates + predicates
+            source = source._source
+
         super(_FilterGenerator, self).__init__(source)
-        self.__predicate = predicate
+        self.__predicates = predicates
 
     def __iter__(self):
-        return filter(self.__predicate, self._source)
+        # Builtin filters are chained rather than composing the predicates
+        # in a Python function, which would add a call per element
+        elements = self._source
+        for predicate, vectorized in self.__predicates:
+            if vectorized:
+                elements = _compress_batches(elements, predicate)
+            else:
+                elements = filter(predicate, elements)
+        return elements
+
+
+def _compress_batches(elements, predicate, size=_FILTER_BATCH_SIZE):
+    """Filter `elements` with a vectorized `predicate`, evaluated on 
+    batches of `size` elements.
+
+    Yields
+    ------
+    object
+        Elements for which the predicate holds.
+    """
+    # `islice` calls `iter` on its input each batch, which would restart
+    # importers
+    elements = (element for element in elements)
+    while True:
+        batch = list(islice(elements, size))
+        if not batch:
+            return
+        yield from compress(batch, predicate(batch))
 
 
 class _MapGenerator(ElementGenerator):
     """An `ElementGenerator` that maps a function over elements in its input.
+
+    Consecutive sequential maps are fused into a single generator holding
+    all functions.
     """
-    def __init__(self, source, map_func):
+    def __init__(self, source, map_func, num_parallel_calls=None):
+        map_funcs = (map_func,)
+        if (num_parallel_calls is None and isinstance(source, _MapGenerator)
+                and source.__num_parallel_calls is None):
+            map_funcs = source.__map_funcs + map_funcs
+            source = source._source
+
         super(_MapGenerator, self).__init__(source)
-        self.__map_func = map_func
+        self.__map_funcs = map_funcs
+        self.__num_parallel_calls = num_parallel_calls
+
+    def __iter__(self):
+        if self.__num_parallel_calls is not None:
+            return self.__parallel_map()
+
+        # Builtin maps are chained rather than composing the functions in a
+        # Python function, which would add a call per element
+        elements = self._source
+        for map_func in self.__map_funcs:
+            elements = map(map_func, elements)
+        return elements
+
+    def __parallel_map(self):
+        elements = iter(self._source)
+
+        # Chunking amortizes the IPC overhead of sending single elements.
+        # Parallel maps are never fused, hence a single function.
+        map_func, = self.__map_funcs
+        workers = self.__num_parallel_calls
+        with ProcessPoolExecutor(workers) as executor:
+            # Bound the number of chunks in flight to keep memory flat
+            pending = deque()
+            for chunk in iter(lambda: list(islice(elements, _MAP_CHUNK_SIZE)),
+                              []):
+                pending.append(executor.submit(_map_chunk, map_func, chunk))
+                if len(pending) >= 2 * workers:
+                    yield from pending.popleft().result()
+
+            while pending:
+                yield from pending.popleft().result()
+
+
+def _map_chunk(map_func, chunk):
+    """Map a function over a chunk of elements, in a worker process.
+
+    Returns
+    -------
+    list
+        Mapped elements.
+    """
+    return [map_func(element) for element in chunk]
+
+
+class _ColumnMapper:
+    """Maps a function across a single attribute column of a trace.
+
+    The source trace is left unchanged, as it might be shared, e.g. by a 
+    cache. A new trace is returned instead, sharing all but the mapped
+    column with the source trace. Unlike a closure, instances are 
+    picklable as long as the function is, hence usable in parallel maps.
+    """
+
+    __slots__ = ('key', 'func', 'vectorized')
+
+    def __init__(self, key, func, vectorized=False):
+        self.key = key
+        self.func = func
+        self.vectorized = vectorized
+
+    def __call__(self, trace):
+        columns = dict(trace.columns)
+        column = columns.get(self.key)
+        if column is not None:
+            columns[self.key] = list(column)
+
+        return Trace(columns, len(trace), attributes=trace.attributes
+                     ).map_column(self.key, self.func,
+                                  vectorized=self.vectorized)
+
+
+class _SelectGenerator(ElementGenerator):
+    """An `ElementGenerator` that projects traces onto attribute columns.
+    """
+
+    def __init__(self, source, keys):
+        super(_SelectGenerator, self).__init__(source)
+        self.__keys = keys
 
     def __iter__(self):
-        return map(self.__map_func, self._source)
\ No newline at end of file
+        if len(self.__keys) == 1:
+            return map(self.__select_one, self._source)
+        return map(self.__select, self._source)
+
+    def __select_one(self, trace):
+        column = trace.columns.get(self.__keys[0])
+        if column is None:
+            return (None,) * len(trace)
+        return tuple(column)
+
+    def __select(self, trace):
+        columns = trace.columns
+        missing = (None,) * len(trace)
+        return tuple(zip(*(columns.get(key, missing) for key in self.__keys)))
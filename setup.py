@@ -22,6 +22,10 @@ requires = [
     "python-dateutil==2.8.1"
 ]
 
+extras = {
+    "fast": ["isal>=1.1"],
+}
+
 test_requirements = [
     'pytest>=3',
 ]
@@ -49,6 +53,7 @@ setuptools.setup(
 
     include_package_data=True,
     install_requires=requires,
+    extras_require=extras,
 
     classifiers=classifiers,
     python_requires=">=3.6",
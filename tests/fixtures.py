@@ -3,6 +3,10 @@ import pytest
 import calendar
 import time
 
+from feldspar.generators import XESImporter
+
+from . import RUNNING_EXAMPLE_XES_PATH
+
 @pytest.fixture
 def tmp_dat_file(tmpdir):
     ts = calendar.timegm(time.gmtime())
@@ -11,3 +15,18 @@ def tmp_dat_file(tmpdir):
     file.close()
     yield filepath
 
+
+@pytest.fixture(scope="session")
+def running_example_traces():
+    """Traces of the running example, parsed once per test session.
+
+    Shared across tests, hence they must not be modified.
+    """
+    return tuple(XESImporter(RUNNING_EXAMPLE_XES_PATH))
+
+
+def assert_traces_equal(elements, target):
+    """Compare two datasets element by element, including their lengths,
+    which a `zip` over both would silently truncate.
+    """
+    assert list(elements) == list(target)
@@ -0,0 +1,84 @@
+import pickle
+from collections.abc import Mapping
+
+import pytest
+
+from feldspar.base import Event, EventView, Trace
+
+
+class TestTrace:
+
+    def test_from_events(self):
+        trace = Trace.from_events(Event({"concept:name": "a"}),
+                                  Event({"concept:name": "b", "org:resource": "Pete"}))
+        assert len(trace) == 2
+        assert trace.columns == {
+            "concept:name": ["a", "b"],
+            "org:resource": [None, "Pete"]
+        }
+
+    def test_getitem_returns_event_view(self):
+        trace = Trace({"concept:name": ["a", "b"]}, 2)
+        assert isinstance(trace[0], EventView)
+        assert trace[-1]["concept:name"] == "b"
+        with pytest.raises(IndexError):
+            trace[2]
+
+    def test_iterate(self):
+        trace = Trace({"concept:name": ["a", "b"]}, 2)
+        assert [e["concept:name"] for e in trace] == ["a", "b"]
+        assert trace.index({"concept:name": "b"}) == 1
+
+    def test_no_instance_dict(self):
+        trace = Trace({"concept:name": ["a"]}, 1)
+        assert not hasattr(trace, "__dict__")
+        assert not hasattr(trace[0], "__dict__")
+
+    def test_event_view_hides_missing_attributes(self):
+        trace = Trace({"concept:name": ["a", "b"],
+                       "org:resource": [None, "Pete"]}, 2)
+        assert dict(trace[0]) == {"concept:name": "a"}
+        assert "org:resource" not in trace[0]
+        assert len(trace[1]) == 2
+
+    def test_event_view_writes_through(self):
+        trace = Trace({"concept:name": ["a", "b"]}, 2)
+        trace[1]["concept:name"] = "c"
+        trace[0]["org:resource"] = "Pete"
+        assert trace.columns == {
+            "concept:name": ["a", "c"],
+            "org:resource": ["Pete", None]
+        }
+
+    def test_slice(self):
+        trace = Trace({"concept:name": ["a", "b", "c"]}, 3)
+        assert trace[1:] == Trace({"concept:name": ["b", "c"]}, 2)
+
+    def test_map_column(self):
+        trace = Trace({"concept:name": ["ab", None, "cd"]}, 3)
+        trace = trace.map_column("concept:name", lambda s: s[0])
+        assert trace.columns["concept:name"] == ["a", None, "c"]
+
+    def test_map_column_vectorized(self):
+        trace = Trace({"concept:name": ["ab", "cd"]}, 2)
+        trace = trace.map_column("concept:name",
+                                 lambda column: [s[1] for s in column],
+                                 vectorized=True)
+        assert trace.columns["concept:name"] == ["b", "d"]
+
+    def test_pickle_round_trip(self):
+        trace = Trace({"concept:name": ["a", "b"]}, 2,
+                      attributes={"concept:name": "1"})
+        assert pickle.loads(pickle.dumps(trace)) == trace
+
+
+class TestEvent:
+
+    def test_event_is_mapping(self):
+        e = Event({"concept:name": "a"})
+        assert isinstance(e, Mapping)
+        assert e == {"concept:name": "a"}
+
+    def test_event_equals_event_view(self):
+        trace = Trace({"concept:name": ["a"]}, 1)
+        assert Event({"concept:name": "a"}) == trace[0]
@@ -1,14 +1,21 @@
+import io
 import os
+import pathlib
+import pickle
+import zipfile
 
 import pytest
 from dateutil.parser import parse
 
-from feldspar.generators import XESImporter, TraceGenerator, _PickleImporter
+from feldspar.generators import (XESImporter, ParallelXESImporter, TraceGenerator,
+                                 _PickleImporter, _parse_timestamp,
+                                 _split_traces, _OPENERS, _MAP_CHUNK_SIZE,
+                                 column_map)
 
 from . import (RUNNING_EXAMPLE_XES_PATH, RUNNING_EXAMPLE_TRACES_LEN_LTEQ_5_PATH,
                RUNNING_EXAMPLE_XES_GZ_PATH, RUNNING_EXAMPLE_XES_ZIP_PATH,
                RUNNING_EXAMPLE_LABELS_INITIALS, RUNNING_EXAMPLE_LABELS_INITIALS_SECOND_LABEL_E)
-from .fixtures import tmp_dat_file
+from .fixtures import assert_traces_equal, running_example_traces, tmp_dat_file
 
 
 class TestXESImporter:
@@ -33,6 +40,48 @@ class TestXESImporter:
         it = XESImporter(RUNNING_EXAMPLE_XES_ZIP_PATH, "infer")
         assert isinstance(it, XESImporter)
 
+    def test_iterate_by_infering_compression(self):
+        for path in [RUNNING_EXAMPLE_XES_PATH, RUNNING_EXAMPLE_XES_GZ_PATH,
+                     RUNNING_EXAMPLE_XES_ZIP_PATH]:
+            it = XESImporter(path, "infer")
+            assert len(list(it)) == 6
+
+    def test_iterate_zip_multiple_passes(self, running_example_traces, monkeypatch):
+        it = XESImporter(RUNNING_EXAMPLE_XES_ZIP_PATH, "zip")
+        assert list(it) == list(running_example_traces)
+        assert it._XESImporter__content is not None
+        assert list(it) == list(running_example_traces)
+
+        # Entries exceeding the memory limit are streamed on every pass
+        monkeypatch.setattr("feldspar.generators._ZIP_MEMORY_LIMIT", 0)
+        it = XESImporter(RUNNING_EXAMPLE_XES_ZIP_PATH, "zip")
+        assert list(it) == list(running_example_traces)
+        assert it._XESImporter__content is None
+        assert list(it) == list(running_example_traces)
+
+    def test_iterate_streamed_zip_after_meta(self, running_example_traces, monkeypatch):
+        monkeypatch.setattr("feldspar.generators._ZIP_MEMORY_LIMIT", 0)
+        L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_ZIP_PATH, "zip")
+        assert list(L) == list(running_example_traces)
+
+    def test_iterate_non_seekable_source_after_meta(self, running_example_traces, monkeypatch):
+        # Streamed zip entries are not seekable on Python 3.6
+        class UnseekableReader(io.BufferedReader):
+            def seekable(self):
+                return False
+
+            def seek(self, *args):
+                raise io.UnsupportedOperation("File or stream is not seekable")
+
+        def open_zip(filepath):
+            with zipfile.ZipFile(filepath) as archive:
+                return UnseekableReader(archive.open(archive.namelist()[0]))
+
+        monkeypatch.setattr("feldspar.generators._ZIP_MEMORY_LIMIT", 0)
+        monkeypatch.setitem(_OPENERS, "zip", open_zip)
+        L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_ZIP_PATH, "zip")
+        assert list(L) == list(running_example_traces)
+
     def test_construct_compressed_object_wo_parameter_or_compression_inference(self):
         with pytest.warns(Warning):
             XESImporter(RUNNING_EXAMPLE_XES_ZIP_PATH)
@@ -45,6 +94,42 @@ class TestXESImporter:
         it = XESImporter(RUNNING_EXAMPLE_XES_PATH)
         assert len(list(it)) == 6
 
+    def test_iterate_with_type_inference(self):
+        it = XESImporter(RUNNING_EXAMPLE_XES_PATH, infer_types=True)
+        trace = next(iter(it))
+        assert trace[0]["time:timestamp"] == parse(
+            "2010-12-30T14:32:00.000+01:00")
+
+    def test_iterate_with_type_inference_malformed_values(self, tmpdir):
+        filepath = os.path.join(str(tmpdir), "malformed.xes")
+        with open(filepath, "w") as handler:
+            handler.write(
+                '<log><trace><event>'
+                '<int key="a" value="1"/><int key="b" value="one"/>'
+                '<float key="c" value="1e999"/><date key="d" value="never"/>'
+                '<boolean key="e"/><boolean key="f" value="1"/>'
+                '<boolean key="g" value="0"/><boolean key="h" value="yes"/>'
+                '</event></trace></log>')
+
+        it = XESImporter(filepath, infer_types=True)
+        event = dict(next(iter(it))[0])
+        assert event == {"a": 1, "b": "one", "c": float("inf"), "d": "never",
+                         "f": True, "g": False, "h": "yes"}
+
+    def test_iterate_interns_activities(self):
+        first, second = list(XESImporter(RUNNING_EXAMPLE_XES_PATH))[:2]
+        assert first[0]["concept:name"] is second[0]["concept:name"]
+
+    def test_parse_timestamp(self):
+        for value in ["2010-12-30T14:32:00.000+01:00",
+                      "2011-10-01T00:38:44.546Z",
+                      "2011-10-01T00:38:44.5-05:30",
+                      "2011-10-01T00:38:44",
+                      "2011/10/01 10:00"]:
+            timestamp = _parse_timestamp(value)
+            assert timestamp == parse(value)
+            assert timestamp.utcoffset() == parse(value).utcoffset()
+
     def test_extract_meta_attributes(self):
         it = XESImporter(RUNNING_EXAMPLE_XES_PATH)
         attributes = it._extract_meta()
@@ -88,6 +173,70 @@ class TestXESImporter:
         }
         assert attributes['omni'] == target
 
+    def test_meta_closes_source(self):
+        for path, compression in [(RUNNING_EXAMPLE_XES_PATH, None),
+                                  (RUNNING_EXAMPLE_XES_GZ_PATH, "gz"),
+                                  (RUNNING_EXAMPLE_XES_ZIP_PATH, "zip")]:
+            it = XESImporter(path, compression)
+            it.meta
+            assert it._XESImporter__source is None
+            assert len(list(it)) == 6
+
+    def test_meta_before_and_after_iteration(self):
+        it = XESImporter(RUNNING_EXAMPLE_XES_PATH)
+        meta = it.meta
+        assert len(list(it)) == 6
+        assert len(list(it)) == 6
+        assert it.meta == meta == XESImporter(
+            RUNNING_EXAMPLE_XES_PATH)._extract_meta()
+
+
+class TestParallelXESImporter:
+
+    def test_iterate_over_object(self):
+        it = ParallelXESImporter(RUNNING_EXAMPLE_XES_PATH, workers=2)
+        assert len(list(it)) == 6
+
+    def test_correct_element_reproduction(self, running_example_traces):
+        target = running_example_traces
+        it = ParallelXESImporter(RUNNING_EXAMPLE_XES_PATH, workers=2)
+        assert list(it) == list(target)
+
+    def test_correct_element_reproduction_gz_compressed(self, running_example_traces):
+        target = running_example_traces
+        it = ParallelXESImporter(RUNNING_EXAMPLE_XES_GZ_PATH, "gz", workers=2)
+        assert list(it) == list(target)
+
+    def test_trace_tag_inside_prolog_comment(self, running_example_traces, tmpdir):
+        with open(RUNNING_EXAMPLE_XES_PATH, "rb") as handler:
+            content = handler.read()
+        declaration = content.index(b"?>") + 2
+        filepath = os.path.join(str(tmpdir), "commented.xes")
+        with open(filepath, "wb") as handler:
+            handler.write(content[:declaration] + b"\n<!-- <trace> -->"
+                          + content[declaration:])
+
+        target = running_example_traces
+        it = ParallelXESImporter(filepath, workers=2)
+        assert list(it) == list(target)
+
+    def test_header_excludes_meta_elements(self):
+        with open(RUNNING_EXAMPLE_XES_PATH, "rb") as handler:
+            blocks = list(_split_traces(handler, 1024))
+
+        header = blocks[0][0]
+        assert header.rstrip().endswith(b">")
+        assert header.lstrip().startswith(b"<?xml")
+        for tag in [b"<extension", b"<global", b"<classifier", b"<string"]:
+            assert tag not in header
+        assert all(h == header for h, _, _ in blocks)
+
+    def test_from_file_with_workers(self):
+        target = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
+        L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH, workers=2)
+        assert L.attributes == target.attributes
+        assert list(L) == list(target)
+
 
 class TestTraceGenerator:
 
@@ -109,15 +258,23 @@ class TestElementGeneratorCaching:
         assert isinstance(L._source, TraceGenerator)
         assert len(list(L)) == 6
         # After iteration, everything should be cached
-        assert isinstance(L._source, list)
+        assert isinstance(L._source, tuple)
         assert len(list(L)) == 6
 
-    def test_cache_correct_element_reproduction(self):
-        target = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
+    def test_cache_warm(self, running_example_traces):
+        target = running_example_traces
+        L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
+        L = L.cache().warm()
+        assert isinstance(L._source, tuple)
+        assert len(list(L)) == 6
+        assert_traces_equal(L, target)
+
+    def test_cache_correct_element_reproduction(self, running_example_traces):
+        target = running_example_traces
         L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
         L = L.cache()
         list(L)
-        assert all(x == y for x, y in zip(L, target))
+        assert_traces_equal(L, target)
 
     def test_cache_to_file_swapping_sources(self, tmp_dat_file):
         assert os.path.getsize(tmp_dat_file) == 0
@@ -128,11 +285,16 @@ class TestElementGeneratorCaching:
         assert isinstance(L._source, _PickleImporter)
         assert len(list(L)) == 6
 
-    def test_cache_to_file_correct_element_reproduction(self, tmp_dat_file):
-        target = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
+    def test_cache_to_file_length(self, tmp_dat_file):
         L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
         L = L.cache(tmp_dat_file)
-        assert all(x == y for x, y in zip(L, target))
+        assert len(L._source) == 6
+
+    def test_cache_to_file_correct_element_reproduction(self, running_example_traces, tmp_dat_file):
+        target = running_example_traces
+        L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
+        L = L.cache(tmp_dat_file)
+        assert_traces_equal(L, target)
 
     def test_cache_before_caching_correct_attributes(self):
         target = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
@@ -159,9 +321,9 @@ class TestElementGeneratorCaching:
         assert L.attributes == target.attributes
         L = L.cache()
         assert L.attributes == target.attributes
-        assert all(x == y for x, y in zip(L, target))
-        assert all(x == y for x, y in zip(L, target))
-        assert all(x == y for x, y in zip(L, target))
+        assert_traces_equal(L, target)
+        assert_traces_equal(L, target)
+        assert_traces_equal(L, target)
         assert L.attributes == target.attributes
 
     def test_cache_to_file_multiple_iterations(self, tmp_dat_file):
@@ -170,20 +332,68 @@ class TestElementGeneratorCaching:
         assert L.attributes == target.attributes
         L = L.cache(tmp_dat_file)
         assert L.attributes == target.attributes
-        assert all(x == y for x, y in zip(L, target))
-        assert all(x == y for x, y in zip(L, target))
-        assert all(x == y for x, y in zip(L, target))
+        assert_traces_equal(L, target)
+        assert_traces_equal(L, target)
+        assert_traces_equal(L, target)
         assert L.attributes == target.attributes
 
-    def test_cache_to_file_persistent_file(self, tmp_dat_file):
-        target = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
+    def test_cache_interrupted_iteration(self, running_example_traces):
+        target = running_example_traces
+        L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
+        L = L.cache()
+        next(iter(L))
+        assert list(L) == list(target)
+        assert isinstance(L._source, tuple)
+        assert list(L) == list(target)
+
+    def test_cache_exceeding_max_elements(self, running_example_traces):
+        target = running_example_traces
+        L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
+        L = L.cache(max_elements=3)
+        with pytest.warns(Warning):
+            assert list(L) == list(target)
+        assert not isinstance(L._source, tuple)
+        assert list(L) == list(target)
+
+    def test_cache_to_file_persistent_file(self, running_example_traces, tmp_dat_file):
+        target = running_example_traces
         L0 = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
         L0 = L0.cache(tmp_dat_file)
 
         L1 = TraceGenerator.from_file(RUNNING_EXAMPLE_TRACES_LEN_LTEQ_5_PATH)
         L1 = L1.cache(tmp_dat_file)
 
-        assert all(x == y for x, y in zip(L1, target))
+        assert_traces_equal(L1, target)
+
+    def test_cache_to_file_interrupted_write(self, tmp_dat_file):
+        def fail(trace):
+            raise RuntimeError("Interrupted.")
+
+        L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
+        with pytest.raises(RuntimeError):
+            L.map(fail).cache(tmp_dat_file)
+        assert os.path.getsize(tmp_dat_file) == 0
+
+        L = L.cache(tmp_dat_file)
+        assert len(list(L)) == 6
+
+    def test_cache_to_path_like_file(self, running_example_traces, tmpdir):
+        filepath = pathlib.Path(str(tmpdir)) / "cache.dat"
+        filepath.touch()
+        L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
+        L = L.cache(filepath)
+        assert list(L) == list(running_example_traces)
+        assert list(L) == list(running_example_traces)
+        # The temporary file has replaced the cache file
+        assert os.listdir(str(tmpdir)) == ["cache.dat"]
+
+    def test_cache_to_file_unknown_format(self, tmp_dat_file):
+        with open(tmp_dat_file, "wb") as handler:
+            pickle.dump("trace", handler)
+
+        L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
+        with pytest.raises(ValueError):
+            L.cache(tmp_dat_file)
 
 
 class TestElementGeneratorFiltering:
@@ -192,15 +402,15 @@ class TestElementGeneratorFiltering:
             RUNNING_EXAMPLE_TRACES_LEN_LTEQ_5_PATH)
         L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
         L = L.filter(lambda trace: len(trace) <= 5)
-        assert all(x == y for x, y in zip(L, target))
+        assert_traces_equal(L, target)
 
     def test_filter_multiple_pass_throughs(self):
         target = TraceGenerator.from_file(
             RUNNING_EXAMPLE_TRACES_LEN_LTEQ_5_PATH)
         L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
         L = L.filter(lambda trace: len(trace) <= 5)
-        assert all(x == y for x, y in zip(L, target))
-        assert all(x == y for x, y in zip(L, target))
+        assert_traces_equal(L, target)
+        assert_traces_equal(L, target)
 
     def test_filter_chaining(self):
         target = TraceGenerator.from_file(
@@ -211,6 +421,30 @@ class TestElementGeneratorFiltering:
                      ["concept:name"] == "pay compensation")
         assert len(list(L)) == 2
 
+    def test_filter_chaining_fuses_generators(self):
+        L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
+        F = L.filter(lambda trace: len(trace) <= 5)
+        F = F.filter(lambda trace: trace[-1]
+                     ["concept:name"] == "pay compensation")
+        assert F._source is L
+        assert len(list(F)) == 2
+
+    def test_filter_vectorized(self):
+        target = TraceGenerator.from_file(
+            RUNNING_EXAMPLE_TRACES_LEN_LTEQ_5_PATH)
+        L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
+        L = L.filter(lambda traces: [len(t) <= 5 for t in traces],
+                     vectorized=True)
+        assert list(L) == list(target)
+
+    def test_filter_vectorized_chaining(self):
+        L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
+        L = L.filter(lambda trace: len(trace) <= 5)
+        L = L.filter(lambda traces: [t[-1]["concept:name"] == "pay compensation"
+                                     for t in traces], vectorized=True)
+        assert len(list(L)) == 2
+        assert len(list(L)) == 2
+
     def test_filter_then_cache(self):
         target = TraceGenerator.from_file(
             RUNNING_EXAMPLE_TRACES_LEN_LTEQ_5_PATH)
@@ -218,16 +452,26 @@ class TestElementGeneratorFiltering:
         L = L.filter(lambda trace: len(trace) <= 5)
         L = L.cache()
 
-        assert all(x == y for x, y in zip(L, target))
+        assert_traces_equal(L, target)
 
     def test_filter_then_map(self):
         target = TraceGenerator.from_file(
             RUNNING_EXAMPLE_LABELS_INITIALS_SECOND_LABEL_E)
         L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
-        L = L.filter(lambda trace: trace[1]["concept:name"].startswith("e") == "e")
+        L = L.filter(lambda trace: trace[1]["concept:name"].startswith("e"))
         L = L.map(TestElementGeneratorMapping.label_initial)
 
-        assert all(x == y for x, y in zip(L, target))
+        assert_traces_equal(L, target)
+
+@column_map("concept:name")
+def _name_initial(name):
+    return name[0]
+
+
+@column_map("Activity", vectorized=True)
+def _activity_initials(column):
+    return [s[0] for s in column]
+
 
 class TestElementGeneratorMapping:
 
@@ -245,7 +489,31 @@ class TestElementGeneratorMapping:
 
         L = L.map(self.label_initial)
 
-        assert all(x == y for x, y in zip(L, target))
+        assert_traces_equal(L, target)
+
+    def test_map_parallel(self):
+        target = TraceGenerator.from_file(
+            RUNNING_EXAMPLE_LABELS_INITIALS)
+        L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
+
+        L = L.map(self.label_initial, num_parallel_calls=2)
+
+        assert_traces_equal(L, target)
+        assert len(list(L)) == 6
+
+    def test_map_parallel_bounds_elements_in_flight(self):
+        pulled = []
+
+        def source():
+            for i in range(20000):
+                pulled.append(i)
+                yield i
+
+        it = iter(TraceGenerator(source()).map(abs, num_parallel_calls=2))
+        assert next(it) == 0
+        # At most twice as many chunks as workers are submitted ahead
+        assert len(pulled) <= (2 * 2 + 1) * _MAP_CHUNK_SIZE
+        assert list(it) == list(range(1, 20000))
 
     def test_map_multiple_pass_through(self):
         target = TraceGenerator.from_file(
@@ -254,8 +522,8 @@ class TestElementGeneratorMapping:
 
         L = L.map(self.label_initial)
 
-        assert all(x == y for x, y in zip(L, target))
-        assert all(x == y for x, y in zip(L, target))
+        assert_traces_equal(L, target)
+        assert_traces_equal(L, target)
 
     def test_map_chaining(self):
         target = [
@@ -271,7 +539,48 @@ class TestElementGeneratorMapping:
         L = L.map(self.label_initial)
         L = L.map(lambda trace: [e["concept:name"] for e in trace])
 
-        assert all(x == y for x, y in zip(L, target))
+        assert_traces_equal(L, target)
+
+    def test_select(self):
+        target = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
+        target = target.map(lambda trace: tuple(e["concept:name"] for e in trace))
+        L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
+        L = L.select("concept:name")
+
+        assert list(L) == list(target)
+
+    def test_select_multiple_keys(self):
+        L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
+        L = L.select("concept:name", "org:resource", "missing")
+
+        first = next(iter(L))
+        assert first[0] == ("register request", "Pete", None)
+        assert len(first) == 9
+
+    def test_to_columnar(self):
+        target = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
+        target = list(target.select("concept:name"))
+        L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
+        columns, offsets = L.to_columnar("concept:name", "missing")
+
+        assert len(offsets) == 7
+        assert all(tuple(columns["concept:name"][i:j]) == names for i, j, names
+                   in zip(offsets, offsets[1:], target))
+        assert columns["missing"] == [None] * offsets[-1]
+
+    def test_to_columnar_all_keys(self):
+        L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
+        columns, offsets = L.to_columnar()
+
+        assert set(columns) == set(next(iter(L)).columns)
+        assert all(len(values) == offsets[-1] for values in columns.values())
+
+    def test_map_chaining_fuses_generators(self):
+        L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
+        M = L.map(self.label_initial)
+        M = M.map(lambda trace: [e["concept:name"] for e in trace])
+        assert M._source is L
+        assert next(iter(M)) == ["r", "e", "c", "d", "r", "e", "c", "d", "p"]
 
     def test_map_then_cache(self):
         target = TraceGenerator.from_file(
@@ -280,7 +589,7 @@ class TestElementGeneratorMapping:
         L = L.map(TestElementGeneratorMapping.label_initial)
         L = L.cache()
 
-        assert all(x == y for x, y in zip(L, target))
+        assert_traces_equal(L, target)
 
     def test_map_then_filter(self):
         target = TraceGenerator.from_file(
@@ -289,4 +598,52 @@ class TestElementGeneratorMapping:
         L = L.map(self.label_initial)
         L = L.filter(lambda trace: trace[1]["concept:name"] == "e")
 
-        assert all(x == y for x, y in zip(L, target))
+        assert_traces_equal(L, target)
+
+    def test_map_column(self):
+        target = TraceGenerator.from_file(
+            RUNNING_EXAMPLE_LABELS_INITIALS)
+        L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
+        L = L.map(lambda trace: trace.map_column("concept:name", lambda s: s[0])
+                                     .map_column("Activity", lambda s: s[0]))
+
+        assert_traces_equal(L, target)
+
+    def test_generator_map_column(self):
+        target = TraceGenerator.from_file(
+            RUNNING_EXAMPLE_LABELS_INITIALS)
+        L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
+        L = L.map_column("concept:name", lambda s: s[0])
+        L = L.map_column("Activity", lambda column: [s[0] for s in column],
+                         vectorized=True)
+
+        assert_traces_equal(L, target)
+
+    def test_cache_then_map_column(self):
+        L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH).cache()
+        M = L.map_column("concept:name", lambda s: s + "!")
+
+        assert next(iter(M))[0]["concept:name"] == "register request!"
+        assert next(iter(M))[0]["concept:name"] == "register request!"
+        list(L)
+        assert [next(iter(M))[0]["concept:name"] for _ in range(2)] == \
+            ["register request!"] * 2
+        assert next(iter(L))[0]["concept:name"] == "register request"
+
+    def test_map_column_decorated(self):
+        target = TraceGenerator.from_file(
+            RUNNING_EXAMPLE_LABELS_INITIALS)
+        L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
+        L = L.map(_name_initial).map(_activity_initials)
+
+        assert _name_initial("register request") == "r"
+        assert_traces_equal(L, target)
+
+    def test_map_column_decorated_parallel(self):
+        target = TraceGenerator.from_file(
+            RUNNING_EXAMPLE_LABELS_INITIALS)
+        L = TraceGenerator.from_file(RUNNING_EXAMPLE_XES_PATH)
+        L = L.map(_name_initial, num_parallel_calls=2)
+        L = L.map(_activity_initials)
+
+        assert_traces_equal(L, target)